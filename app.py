@@ -1,10 +1,23 @@
-from flask import Flask, request, jsonify, render_template
+from flask import Flask, Response, request, jsonify, render_template, stream_with_context
 from flask_sqlalchemy import SQLAlchemy
 from flask_cors import CORS
+from sqlalchemy import event, func, inspect, select, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import joinedload, raiseload
+import orjson
+import hmac
 import os
 import random
+import re
+import sqlite3
+import threading
 import logging
+import queue
+import atexit
+from logging.handlers import QueueHandler, QueueListener
 from datetime import datetime
+from functools import lru_cache
 
 app = Flask(__name__)
 CORS(app)
@@ -13,18 +26,63 @@ CORS(app)
 app.config['SQLALCHEMY_DATABASE_URI'] = os.getenv('DATABASE_URL', 'sqlite:///chess_memory.db')
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'dev-secret-key')
+# Publicly known placeholder keys (this file and docker-compose.yml) that must not unlock admin routes
+DEFAULT_SECRET_KEYS = {'dev-secret-key', 'your-secret-key-change-in-production'}
+
+# Connection pool: keep warm connections around and recycle them before the server drops them
+if app.config['SQLALCHEMY_DATABASE_URI'].startswith('sqlite'):
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+        'connect_args': {'check_same_thread': False}
+    }
+else:
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+        'pool_size': 10,
+        'max_overflow': 20,
+        'pool_recycle': 3600,
+        'pool_pre_ping': True
+    }
 
 # Database setup
 db = SQLAlchemy(app)
 
-# Logger setup
-logging.basicConfig(level=logging.INFO)
-app.logger.setLevel(logging.INFO)
+
+@event.listens_for(Engine, 'connect')
+def set_sqlite_pragma(dbapi_connection, connection_record):
+    """Enable WAL on SQLite so readers are not blocked while a submit writes"""
+    if isinstance(dbapi_connection, sqlite3.Connection):
+        cursor = dbapi_connection.cursor()
+        cursor.execute('PRAGMA journal_mode=WAL')
+        cursor.execute('PRAGMA synchronous=NORMAL')
+        cursor.close()
+
+
+# Logger setup: handlers only enqueue records, a background listener does the formatting and IO
+log_level = getattr(logging, os.getenv('LOG_LEVEL', 'INFO').upper(), logging.INFO)
+logging.basicConfig(level=log_level)
+app.logger.setLevel(log_level)
+app.logger.propagate = False
 handler = logging.StreamHandler()
-handler.setLevel(logging.INFO)
+handler.setLevel(log_level)
 formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 handler.setFormatter(formatter)
-app.logger.addHandler(handler)
+queue_handler = QueueHandler(queue.Queue(-1))
+app.logger.addHandler(queue_handler)
+
+
+def start_log_listener():
+    """Start the thread that drains the log queue; forked workers must call it again"""
+    log_queue = queue.Queue(-1)
+    queue_handler.queue = log_queue
+    listener = QueueListener(log_queue, handler, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+
+
+start_log_listener()
+
+
+# Board, side to move, castling, en passant and optional move counters
+_FEN_RE = re.compile(r'([rnbqkpRNBQKP1-8]+/){7}[rnbqkpRNBQKP1-8]+ [wb] [KQkq-]{1,4} [-a-h1-8]{1,2}( \d+){0,2}')
 
 
 # Models
@@ -33,7 +91,8 @@ class ChessPosition(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     fen = db.Column(db.String(100), nullable=False)
     evaluation = db.Column(db.Float)
-    piece_count = db.Column(db.Integer, nullable=False)
+    piece_count = db.Column(db.Integer, nullable=False, index=True)
+    board64 = db.Column(db.String(64))
 
     def to_dict(self):
         return {
@@ -47,11 +106,13 @@ class ChessPosition(db.Model):
 class GameSession(db.Model):
     __tablename__ = 'game_sessions'
     id = db.Column(db.Integer, primary_key=True)
-    piece_count = db.Column(db.Integer, nullable=False)
+    piece_count = db.Column(db.Integer, nullable=False, index=True)
     position_id = db.Column(db.Integer, db.ForeignKey('chess_positions.id'))
     user_answer = db.Column(db.String(100))
-    score = db.Column(db.Integer)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    score = db.Column(db.Integer, index=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+
+    position = db.relationship('ChessPosition')
 
     def to_dict(self):
         return {
@@ -64,52 +125,57 @@ class GameSession(db.Model):
         }
 
 
+class DataVersion(db.Model):
+    """Single-row counter bumped whenever the positions are reloaded"""
+    __tablename__ = 'data_version'
+    id = db.Column(db.Integer, primary_key=True)
+    generation = db.Column(db.Integer, nullable=False, default=0)
+
+
 # Routes
 @app.route('/')
 def index():
-    app.logger.info('Index page accessed')
+    app.logger.debug('Index page accessed')
     return render_template('index.html')
 
 
 @app.route('/health', methods=['GET'])
 def health():
     """Health check endpoint for CI/CD"""
-    app.logger.info('Health check accessed')
+    app.logger.debug('Health check accessed')
     return jsonify({'status': 'healthy', 'message': 'Application is running'}), 200
 
 
 @app.route('/api/positions', methods=['GET'])
 def get_positions():
-    """Get all chess positions"""
-    app.logger.info('Fetching all positions')
+    """Get chess positions, one keyset page at a time (?after_id=&limit=)"""
+    app.logger.debug('Fetching positions')
     try:
-        positions = ChessPosition.query.all()
-        return jsonify([pos.to_dict() for pos in positions]), 200
+        return positions_page_response('all')
     except Exception as e:
-        app.logger.error(f'Error fetching positions: {str(e)}')
+        app.logger.error('Error fetching positions: %s', e)
         return jsonify({'error': 'Failed to fetch positions'}), 500
 
 
 @app.route('/api/positions/count/<int:piece_count>', methods=['GET'])
 def get_positions_by_count(piece_count):
-    """Get positions by piece count"""
-    app.logger.info(f'Fetching positions with {piece_count} pieces')
+    """Get positions by piece count, one keyset page at a time (?after_id=&limit=)"""
+    app.logger.debug('Fetching positions with %s pieces', piece_count)
     try:
         if piece_count < 2 or piece_count > 32:
-            app.logger.warning(f'Invalid piece count: {piece_count}')
+            app.logger.warning('Invalid piece count: %s', piece_count)
             return jsonify({'error': 'Piece count must be between 2 and 32'}), 400
 
-        positions = ChessPosition.query.filter_by(piece_count=piece_count).all()
-        return jsonify([pos.to_dict() for pos in positions]), 200
+        return positions_page_response(piece_count, ChessPosition.piece_count == piece_count)
     except Exception as e:
-        app.logger.error(f'Error fetching positions by count: {str(e)}')
+        app.logger.error('Error fetching positions by count: %s', e)
         return jsonify({'error': 'Failed to fetch positions'}), 500
 
 
 @app.route('/api/game/start', methods=['POST'])
 def start_game():
     """Start a new game session"""
-    app.logger.info('Starting new game session')
+    app.logger.debug('Starting new game session')
     try:
         data = request.get_json()
 
@@ -120,18 +186,30 @@ def start_game():
         piece_count = data['piece_count']
 
         if not isinstance(piece_count, int) or piece_count < 2 or piece_count > 32:
-            app.logger.warning(f'Invalid piece count: {piece_count}')
+            app.logger.warning('Invalid piece count: %s', piece_count)
             return jsonify({'error': 'piece_count must be an integer between 2 and 32'}), 400
 
-        # Get random position with specified piece count
-        positions = ChessPosition.query.filter_by(piece_count=piece_count).all()
-
-        if not positions:
-            app.logger.warning(f'No positions found for piece count: {piece_count}')
+        # Pick a random id from the in-memory cache and fetch just that row
+        refresh_position_cache()
+        position_ids = POSITIONS_BY_COUNT.get(piece_count)
+        selected_position = db.session.get(ChessPosition, random.choice(position_ids)) if position_ids else None
+
+        if selected_position is not None and selected_position.piece_count != piece_count:
+            selected_position = None
+
+        if not selected_position:
+            if position_ids:
+                # The cache pointed at a missing or reused id, so it is stale
+                app.logger.warning('Position cache is stale, rebuilding')
+                refresh_position_cache(stale=True)
+            # Let the database pick one
+            selected_position = ChessPosition.query.filter_by(piece_count=piece_count) \
+                .order_by(func.random()).first()
+
+        if not selected_position:
+            app.logger.warning('No positions found for piece count: %s', piece_count)
             return jsonify({'error': f'No positions available for {piece_count} pieces'}), 404
 
-        selected_position = random.choice(positions)
-
         # Create game session
         session = GameSession(
             piece_count=piece_count,
@@ -140,7 +218,7 @@ def start_game():
         db.session.add(session)
         db.session.commit()
 
-        app.logger.info(f'Game session {session.id} created with position {selected_position.id}')
+        app.logger.debug('Game session %s created with position %s', session.id, selected_position.id)
 
         return jsonify({
             'session_id': session.id,
@@ -149,7 +227,7 @@ def start_game():
         }), 201
 
     except Exception as e:
-        app.logger.error(f'Error starting game: {str(e)}')
+        app.logger.error('Error starting game: %s', e)
         db.session.rollback()
         return jsonify({'error': 'Failed to start game'}), 500
 
@@ -157,7 +235,7 @@ def start_game():
 @app.route('/api/game/submit', methods=['POST'])
 def submit_answer():
     """Submit user's answer and get score"""
-    app.logger.info('Submitting answer')
+    app.logger.debug('Submitting answer')
     try:
         data = request.get_json()
 
@@ -168,129 +246,297 @@ def submit_answer():
         session_id = data['session_id']
         user_fen = data['user_fen']
 
-        session = GameSession.query.get(session_id)
+        # Reject malformed FENs before touching the database
+        if (not isinstance(user_fen, str) or not _FEN_RE.fullmatch(user_fen)
+                or not has_valid_ranks(user_fen)):
+            app.logger.warning('Invalid FEN in submit request')
+            return jsonify({'error': 'user_fen must be a valid FEN string'}), 400
+
+        # Load the session and its position with one JOINed SELECT
+        session = db.session.get(GameSession, session_id,
+                                 options=[joinedload(GameSession.position), raiseload('*')])
         if not session:
-            app.logger.warning(f'Session not found: {session_id}')
+            app.logger.warning('Session not found: %s', session_id)
             return jsonify({'error': 'Session not found'}), 404
 
-        original_position = ChessPosition.query.get(session.position_id)
+        original_position = session.position
+
+        # Expand both boards once and reuse them for scoring and differences
+        correct_board = original_position.board64 or expand_fen(original_position.fen)
+        user_board = expand_fen(user_fen)
 
         # Calculate score (number of correct pieces)
-        score = calculate_score(original_position.fen, user_fen)
+        score = calculate_score(correct_board, user_board)
 
         session.user_answer = user_fen
         session.score = score
         db.session.commit()
 
-        app.logger.info(f'Answer submitted for session {session_id}, score: {score}')
+        app.logger.debug('Answer submitted for session %s, score: %s', session_id, score)
 
         return jsonify({
             'score': score,
             'total_pieces': session.piece_count,
             'correct_fen': original_position.fen,
             'user_fen': user_fen,
-            'differences': get_differences(original_position.fen, user_fen)
+            'differences': get_differences(correct_board, user_board)
         }), 200
 
     except Exception as e:
-        app.logger.error(f'Error submitting answer: {str(e)}')
+        app.logger.error('Error submitting answer: %s', e)
         db.session.rollback()
         return jsonify({'error': 'Failed to submit answer'}), 500
 
 
+@app.route('/admin/reload', methods=['POST'])
+def reload_positions():
+    """Tell every worker to rebuild its position cache"""
+    app.logger.info('Reloading position cache')
+    secret_key = app.config['SECRET_KEY']
+    if not secret_key or secret_key in DEFAULT_SECRET_KEYS:
+        app.logger.warning('Rejected position cache reload: SECRET_KEY is not configured')
+        return jsonify({'error': 'Admin endpoints are disabled until SECRET_KEY is set'}), 403
+
+    if not hmac.compare_digest(request.headers.get('X-Admin-Key', '').encode(), secret_key.encode()):
+        app.logger.warning('Rejected position cache reload with invalid admin key')
+        return jsonify({'error': 'Forbidden'}), 403
+
+    try:
+        bump_generation()
+        db.session.commit()
+        refresh_position_cache(stale=True)
+        return jsonify({'positions': sum(len(ids) for ids in POSITIONS_BY_COUNT.values())}), 200
+    except Exception as e:
+        app.logger.error('Error reloading positions: %s', e)
+        db.session.rollback()
+        return jsonify({'error': 'Failed to reload positions'}), 500
+
+
 @app.route('/api/sessions', methods=['GET'])
 def get_sessions():
     """Get all game sessions"""
-    app.logger.info('Fetching all sessions')
+    app.logger.debug('Fetching all sessions')
     try:
-        sessions = GameSession.query.order_by(GameSession.created_at.desc()).limit(100).all()
-        return jsonify([s.to_dict() for s in sessions]), 200
+        # Select plain rows; orjson serializes created_at without an isoformat() call
+        stmt = select(
+            GameSession.id, GameSession.piece_count, GameSession.position_id,
+            GameSession.user_answer, GameSession.score, GameSession.created_at
+        ).order_by(GameSession.created_at.desc()).limit(100)
+        return Response(orjson.dumps([row._asdict() for row in db.session.execute(stmt)]),
+                        mimetype='application/json')
     except Exception as e:
-        app.logger.error(f'Error fetching sessions: {str(e)}')
+        app.logger.error('Error fetching sessions: %s', e)
         return jsonify({'error': 'Failed to fetch sessions'}), 500
 
 
 @app.route('/api/stats', methods=['GET'])
 def get_stats():
     """Get game statistics"""
-    app.logger.info('Fetching statistics')
+    app.logger.debug('Fetching statistics')
     try:
-        total_games = GameSession.query.filter(GameSession.score.isnot(None)).count()
+        # Count and sum finished sessions in a single aggregate query
+        total_games, total_correct, total_pieces = db.session.query(
+            func.count(GameSession.id),
+            func.coalesce(func.sum(GameSession.score), 0),
+            func.coalesce(func.sum(GameSession.piece_count), 0)
+        ).filter(GameSession.score.isnot(None)).one()
 
-        if total_games > 0:
-            # Calculate percentage: (correct pieces / total pieces) * 100
-            sessions = GameSession.query.filter(GameSession.score.isnot(None)).all()
-            total_correct = sum(s.score for s in sessions)
-            total_pieces = sum(s.piece_count for s in sessions)
-            avg_percentage = (total_correct / total_pieces * 100) if total_pieces > 0 else 0
-        else:
-            avg_percentage = 0
+        # Calculate percentage: (correct pieces / total pieces) * 100
+        avg_percentage = (total_correct / total_pieces * 100) if total_pieces > 0 else 0
 
         return jsonify({
             'total_games': total_games,
             'average_score': round(avg_percentage, 2)
         }), 200
     except Exception as e:
-        app.logger.error(f'Error fetching stats: {str(e)}')
+        app.logger.error('Error fetching stats: %s', e)
         return jsonify({'error': 'Failed to fetch statistics'}), 500
 
 
 # Helper functions
-def calculate_score(correct_fen, user_fen):
-    """Calculate score based on correct pieces placement"""
-    correct_board = fen_to_board(correct_fen)
-    user_board = fen_to_board(user_fen)
+def positions_page_response(etag_key, *criteria):
+    """Stream one keyset page of positions matching criteria, with an ETag for the page"""
+    after_id = request.args.get('after_id', 0, type=int)
+    limit = max(1, min(1000, request.args.get('limit', 200, type=int)))
+
+    # MAX(id) is a primary-key index lookup, so the ETag costs the same however large the table is;
+    # reloads reuse ids, so the generation is what tells old and new content apart
+    max_id = db.session.query(func.max(ChessPosition.id)).scalar()
+    fingerprint = f'{current_generation()}-{max_id}-{etag_key}-{after_id}-{limit}'
+    if fingerprint in request.if_none_match:
+        response = Response(status=304)
+        response.set_etag(fingerprint)
+        return response
+
+    stmt = select(ChessPosition.id, ChessPosition.fen, ChessPosition.evaluation, ChessPosition.piece_count) \
+        .where(ChessPosition.id > after_id, *criteria).order_by(ChessPosition.id).limit(limit)
+    result = db.session.execute(stmt).yield_per(500)
+
+    response = Response(stream_with_context(stream_rows(result)), mimetype='application/json')
+    response.set_etag(fingerprint)
+    return response
+
+
+def stream_rows(result):
+    """Stream a row result as a JSON array, one chunk per fetched partition"""
+    yield b'['
+    first = True
+    for partition in result.partitions():
+        chunk = b','.join(orjson.dumps(row._asdict()) for row in partition)
+        yield chunk if first else b',' + chunk
+        first = False
+    yield b']'
+
+
+# piece_count -> ids of positions with that many pieces, built on first use
+POSITIONS_BY_COUNT = {}
+# DataVersion generation POSITIONS_BY_COUNT was built from, and how many times it was built
+_cache_generation = None
+_cache_builds = 0
+# Only one request thread per worker scans the positions table at a time
+_cache_lock = threading.Lock()
+
+
+def current_generation():
+    """Current positions generation (0 until the positions are first reloaded)"""
+    version = db.session.get(DataVersion, 1)
+    return version.generation if version else 0
+
+
+def seed_data_version():
+    """Create the DataVersion row once, so bump_generation only ever has to UPDATE it"""
+    if db.session.get(DataVersion, 1) is None:
+        db.session.add(DataVersion(id=1, generation=0))
+        try:
+            db.session.commit()
+        except IntegrityError:
+            # Another process seeded it first
+            db.session.rollback()
+
+
+def bump_generation():
+    """Record a positions reload so every worker rebuilds its caches; the caller commits"""
+    db.session.query(DataVersion).filter_by(id=1) \
+        .update({DataVersion.generation: DataVersion.generation + 1}, synchronize_session='fetch')
+
+
+def load_position_cache():
+    """Rebuild POSITIONS_BY_COUNT from the database (callers hold _cache_lock)"""
+    global _cache_generation, _cache_builds
+    # Read the generation first, so a reload that lands while building triggers another rebuild
+    generation = current_generation()
+
+    positions_by_count = {}
+    for piece_count, position_id in db.session.query(ChessPosition.piece_count, ChessPosition.id):
+        positions_by_count.setdefault(piece_count, []).append(position_id)
+
+    POSITIONS_BY_COUNT.clear()
+    POSITIONS_BY_COUNT.update(positions_by_count)
+    _cache_generation = generation
+    _cache_builds += 1
+
+
+def refresh_position_cache(stale=False):
+    """Rebuild the cache if the positions were reloaded (by any process) or the caller found it stale"""
+    builds = _cache_builds
+    if not stale and current_generation() == _cache_generation:
+        return
+
+    with _cache_lock:
+        # Threads that queued up behind a rebuild reuse it instead of scanning again
+        if _cache_builds != builds:
+            return
+        if not stale and current_generation() == _cache_generation:
+            return
+        load_position_cache()
+
+
+def has_valid_ranks(fen):
+    """Check that the FEN board has 8 ranks and every rank describes exactly 8 squares"""
+    ranks = fen.split(' ', 1)[0].split('/')
+    return len(ranks) == 8 and all(
+        sum(int(c) if c.isdigit() else 1 for c in rank) == 8 for rank in ranks
+    )
+
+
+# FEN digit -> run of empty squares
+_EMPTY_RUNS = {str(n): '.' * n for n in range(1, 9)}
+
+
+@lru_cache(maxsize=4096)
+def expand_fen(fen):
+    """Expand the board part of a FEN into a flat 64-char string (empty squares as '.')"""
+    board = fen.split(' ', 1)[0].replace('/', '')
+    for digit, run in _EMPTY_RUNS.items():
+        board = board.replace(digit, run)
+    return board
 
-    score = 0
-    for i in range(8):
-        for j in range(8):
-            if correct_board[i][j] == user_board[i][j]:
-                if correct_board[i][j] != '.':  # Only count pieces, not empty squares
-                    score += 1
 
-    return score
+def _to_int(board_bytes):
+    """Read a 64-byte board as one integer (boards are validated to 64 squares on input)"""
+    return int.from_bytes(board_bytes, 'big')
 
 
-def fen_to_board(fen):
-    """Convert FEN to 8x8 board representation"""
-    board = []
-    fen_board = fen.split()[0]
+# Translation table mapping empty squares to 0xFF and pieces to 0x00
+_EMPTY_MASK = bytes(0xFF if b == ord('.') else 0 for b in range(256))
+_NONZERO_BYTE = re.compile(rb'[^\x00]')
 
-    for row in fen_board.split('/'):
-        board_row = []
-        for char in row:
-            if char.isdigit():
-                board_row.extend(['.'] * int(char))
-            else:
-                board_row.append(char)
-        board.append(board_row)
 
-    return board
+def calculate_score(correct_board, user_board):
+    """Calculate score based on correct pieces placement"""
+    correct_bytes = correct_board.encode()
+    # XOR leaves a zero byte on every square where both boards agree;
+    # OR-ing in the empty-square mask drops matches on empty squares
+    mismatch = _to_int(correct_bytes) ^ _to_int(user_board.encode())
+    mismatch |= _to_int(correct_bytes.translate(_EMPTY_MASK))
+    return mismatch.to_bytes(64, 'big').count(0)
+
+
+# Square names in expanded-board order: a8, b8, ..., h1
+_SQUARES = [f"{file}{rank}" for rank in range(8, 0, -1) for file in 'abcdefgh']
 
 
-def get_differences(correct_fen, user_fen):
+def get_differences(correct_board, user_board):
     """Get list of differences between correct and user positions"""
-    correct_board = fen_to_board(correct_fen)
-    user_board = fen_to_board(user_fen)
+    if correct_board == user_board:
+        return []
 
-    differences = []
-    for i in range(8):
-        for j in range(8):
-            if correct_board[i][j] != user_board[i][j]:
-                differences.append({
-                    'square': f"{chr(97 + j)}{8 - i}",
-                    'correct': correct_board[i][j],
-                    'user': user_board[i][j]
-                })
+    correct_bytes = correct_board.encode()
+    user_bytes = user_board.encode()
+    mismatch = (_to_int(correct_bytes) ^ _to_int(user_bytes)).to_bytes(64, 'big')
 
-    return differences
+    # Only the mismatching squares are visited and turned into dicts
+    mismatched = [match.start() for match in _NONZERO_BYTE.finditer(mismatch)]
+    return [
+        {'square': _SQUARES[i], 'correct': chr(correct_bytes[i]), 'user': chr(user_bytes[i])}
+        for i in mismatched
+    ]
 
 
 # Initialize database
 with app.app_context():
     db.create_all()
+    # create_all() skips tables that already exist, so add any missing columns and indexes explicitly
+    inspector = inspect(db.engine)
+    for table in db.metadata.sorted_tables:
+        existing_columns = {column['name'] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name not in existing_columns and column.nullable:
+                column_type = column.type.compile(dialect=db.engine.dialect)
+                with db.engine.begin() as connection:
+                    connection.execute(text(f'ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}'))
+                app.logger.info('Added missing column %s.%s', table.name, column.name)
+        for table_index in table.indexes:
+            table_index.create(db.engine, checkfirst=True)
+    seed_data_version()
+    # POSITIONS_BY_COUNT is built on first use, so importing the app (e.g. from load_data.py) stays cheap
     app.logger.info('Database initialized')
 
 if __name__ == '__main__':
-    port = int(os.getenv('PORT', 5000))
-    app.run(host='0.0.0.0', port=port, debug=os.getenv('FLASK_ENV') == 'development')
\ No newline at end of file
+    # Development server only; production runs under gunicorn (see gunicorn.conf.py)
+    if os.getenv('FLASK_ENV') == 'development':
+        port = int(os.getenv('PORT', 5000))
+        app.run(host='0.0.0.0', port=port, debug=True)
+    else:
+        print('Use the development server with FLASK_ENV=development, '
+              'or run: gunicorn -c gunicorn.conf.py app:app')
@@ -0,0 +1,20 @@
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '5000')}"
+workers = int(os.getenv('WEB_CONCURRENCY', (os.cpu_count() or 1) * 2 + 1))
+worker_class = 'gthread'
+threads = 4
+
+# Import the app once in the master so workers share its memory copy-on-write
+preload_app = True
+
+
+def post_fork(server, worker):
+    """Reset per-process state the preloaded app created in the master"""
+    from app import app, db, start_log_listener
+
+    # Threads do not survive fork, so each worker needs its own log listener
+    start_log_listener()
+    # Never share the master's pooled connections with the workers
+    with app.app_context():
+        db.engine.dispose(close=False)
@@ -1,5 +1,8 @@
 import csv
-from app import app, db, ChessPosition
+from sqlalchemy import func
+from app import app, db, ChessPosition, expand_fen, has_valid_ranks, bump_generation
+
+BATCH_SIZE = 5000
 
 
 def load_positions_from_csv(filename='data/puzzles.csv'):
@@ -9,39 +12,58 @@ def load_positions_from_csv(filename='data/puzzles.csv'):
         ChessPosition.query.delete()
 
         count = 0
-        with open(filename, 'r') as file:
+        skipped = 0
+        rows = []
+        with open(filename, 'r') as file, db.session.no_autoflush:
             csv_reader = csv.reader(file)
             next(csv_reader)  # Skip header if present
 
             for row in csv_reader:
-                if len(row) >= 3:
+                if row and row[0].strip():
                     fen = row[0].strip()
-                    evaluation = 0.0
-                    piece_count = int(row[2])
-
-                    position = ChessPosition(
-                        fen=fen,
-                        evaluation=evaluation,
-                        piece_count=piece_count
-                    )
-                    db.session.add(position)
+                    if not has_valid_ranks(fen):
+                        print(f"Skipping malformed FEN (ranks must describe 8 squares each): {fen}")
+                        skipped += 1
+                        continue
+
+                    # Every row is a new FEN, so bypass the app's expansion cache
+                    board64 = expand_fen.__wrapped__(fen)
+
+                    rows.append({
+                        'fen': fen,
+                        'evaluation': 0.0,
+                        # Derive the piece count from the FEN instead of trusting the CSV column
+                        'piece_count': sum(c.isalpha() for c in board64),
+                        'board64': board64
+                    })
                     count += 1
 
-                    if count % 100 == 0:
+                    # Insert in batches with executemany instead of one ORM object per row
+                    if len(rows) >= BATCH_SIZE:
+                        db.session.bulk_insert_mappings(ChessPosition, rows)
+                        db.session.commit()
+                        rows.clear()
                         print(f"Loaded {count} positions...")
 
+            if rows:
+                db.session.bulk_insert_mappings(ChessPosition, rows)
+
+        # Running app workers notice the new generation and rebuild their caches
+        bump_generation()
         db.session.commit()
         print(f"Successfully loaded {count} positions into database")
+        if skipped:
+            print(f"Skipped {skipped} rows with malformed FEN")
 
         # Print statistics
-        for pc in range(2, 33):
-            count_pc = ChessPosition.query.filter_by(piece_count=pc).count()
-            if count_pc > 0:
-                print(f"  {pc} pieces: {count_pc} positions")
+        counts = db.session.query(ChessPosition.piece_count, func.count(ChessPosition.id)) \
+            .group_by(ChessPosition.piece_count).order_by(ChessPosition.piece_count).all()
+        for pc, count_pc in counts:
+            print(f"  {pc} pieces: {count_pc} positions")
 
 
 if __name__ == '__main__':
     import sys
 
     filename = sys.argv[1] if len(sys.argv) > 1 else 'data/puzzles.csv'
-    load_positions_from_csv(filename)
\ No newline at end of file
+    load_positions_from_csv(filename)
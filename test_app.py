@@ -1,6 +1,7 @@
 import pytest
 import json
-from app import app, db, ChessPosition, GameSession
+from app import app, db, ChessPosition, GameSession, expand_fen, calculate_score, get_differences, \
+    bump_generation, seed_data_version, refresh_position_cache, POSITIONS_BY_COUNT
 
 
 @pytest.fixture
@@ -12,6 +13,7 @@ def client():
     with app.test_client() as client:
         with app.app_context():
             db.create_all()
+            seed_data_version()
             # Add test data
             test_position = ChessPosition(
                 fen='rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1',
@@ -68,6 +70,25 @@ class TestInputValidation:
         assert 'error' in data
         assert 'required' in data['error']
 
+    def test_submit_answer_invalid_fen(self, client):
+        """Test submit answer with a malformed FEN"""
+        response = client.post('/api/game/submit',
+                               data=json.dumps({'session_id': 1, 'user_fen': 'not a fen'}),
+                               content_type='application/json')
+        assert response.status_code == 400
+        data = json.loads(response.data)
+        assert 'FEN' in data['error']
+
+    def test_submit_answer_fen_with_wrong_square_count(self, client):
+        """Test submit answer rejects FENs whose ranks do not each describe 8 squares"""
+        for user_fen in ['88/8/8/8/8/8/8/8 w - - 0 1', '1/1/1/1/1/1/1/K w - - 0 1',
+                         'ppppppppp/7/8/8/8/8/8/8 w - - 0 1',
+                         'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1\n']:
+            response = client.post('/api/game/submit',
+                                   data=json.dumps({'session_id': 1, 'user_fen': user_fen}),
+                                   content_type='application/json')
+            assert response.status_code == 400
+
 
 class TestErrorHandling:
     """Unit tests for error handling"""
@@ -102,6 +123,36 @@ class TestErrorHandling:
         assert 'error' in data
 
 
+class TestScoring:
+    """Unit tests for board expansion and scoring helpers"""
+
+    def test_expand_fen(self):
+        """Test FEN expansion into a flat 64-char board"""
+        board = expand_fen('8/3K4/8/8/3k4/8/8/8 w - - 0 67')
+        assert len(board) == 64
+        assert board[11] == 'K'
+        assert board[35] == 'k'
+        assert board.count('.') == 62
+
+    def test_calculate_score(self):
+        """Test score counts only matching pieces"""
+        correct = expand_fen('8/3K4/8/8/3k4/8/8/8 w - - 0 67')
+        user = expand_fen('8/3K4/8/8/8/4k3/8/8 w - - 0 1')
+        assert calculate_score(correct, correct) == 2
+        assert calculate_score(correct, user) == 1
+
+    def test_get_differences(self):
+        """Test differences report squares in algebraic notation"""
+        correct = expand_fen('8/3K4/8/8/3k4/8/8/8 w - - 0 67')
+        user = expand_fen('8/3K4/8/8/8/4k3/8/8 w - - 0 1')
+        differences = get_differences(correct, user)
+        assert differences == [
+            {'square': 'd4', 'correct': 'k', 'user': '.'},
+            {'square': 'e3', 'correct': '.', 'user': 'k'}
+        ]
+        assert get_differences(correct, correct) == []
+
+
 # Integration Tests
 class TestGameFlow:
     """Integration tests for complete game flow"""
@@ -134,6 +185,22 @@ class TestGameFlow:
         assert 'correct_fen' in submit_data
         assert 'differences' in submit_data
 
+    def test_stats_after_game(self, client):
+        """Test statistics aggregate finished sessions"""
+        start_data = json.loads(client.post('/api/game/start',
+                                            data=json.dumps({'piece_count': 32}),
+                                            content_type='application/json').data)
+        client.post('/api/game/submit',
+                    data=json.dumps({
+                        'session_id': start_data['session_id'],
+                        'user_fen': start_data['fen']
+                    }),
+                    content_type='application/json')
+
+        data = json.loads(client.get('/api/stats').data)
+        assert data['total_games'] == 1
+        assert data['average_score'] == 100.0
+
     def test_health_check(self, client):
         """Test health check endpoint"""
         response = client.get('/health')
@@ -153,6 +220,54 @@ class TestAPIEndpoints:
         assert isinstance(data, list)
         assert len(data) > 0
 
+    def test_get_positions_paginated(self, client):
+        """Test positions are paged by id with after_id and limit"""
+        response = client.get('/api/positions?limit=1')
+        data = json.loads(response.data)
+        assert len(data) == 1
+
+        next_response = client.get(f"/api/positions?after_id={data[-1]['id']}&limit=1")
+        assert next_response.status_code == 200
+        assert json.loads(next_response.data) == []
+
+    def test_get_positions_by_count_paginated(self, client):
+        """Test positions by piece count are paged by id with after_id and limit"""
+        with app.app_context():
+            db.session.add(ChessPosition(fen='8/3K4/8/8/3k4/8/8/8 w - - 0 67', evaluation=0.0, piece_count=2))
+            db.session.add(ChessPosition(fen='8/8/8/8/8/8/4k3/6K1 w - - 0 70', evaluation=0.0, piece_count=2))
+            db.session.commit()
+
+        data = json.loads(client.get('/api/positions/count/2?limit=1').data)
+        assert len(data) == 1
+        assert data[0]['piece_count'] == 2
+
+        next_data = json.loads(client.get(f"/api/positions/count/2?after_id={data[0]['id']}").data)
+        assert [p['piece_count'] for p in next_data] == [2]
+
+    def test_get_positions_not_modified(self, client):
+        """Test positions are served with an ETag and revalidated with 304"""
+        response = client.get('/api/positions')
+        assert json.loads(response.data)
+        etag = response.headers['ETag']
+        assert etag
+
+        cached_response = client.get('/api/positions', headers={'If-None-Match': etag})
+        assert cached_response.status_code == 304
+
+    def test_positions_etag_changes_after_reload(self, client):
+        """Test a reload with the same ids and row count still changes the ETag"""
+        etag = client.get('/api/positions/count/32').headers['ETag']
+
+        with app.app_context():
+            position = db.session.get(ChessPosition, 1)
+            position.fen = 'rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b KQkq - 0 1'
+            bump_generation()
+            db.session.commit()
+
+        response = client.get('/api/positions/count/32', headers={'If-None-Match': etag})
+        assert response.status_code == 200
+        assert json.loads(response.data)[0]['fen'].startswith('rnbqkbnr/pppppppp/8/8/4P3')
+
     def test_get_positions_by_count(self, client):
         """Test getting positions by piece count"""
         response = client.get('/api/positions/count/32')
@@ -162,10 +277,16 @@ class TestAPIEndpoints:
 
     def test_get_sessions(self, client):
         """Test getting all sessions"""
+        client.post('/api/game/start',
+                    data=json.dumps({'piece_count': 32}),
+                    content_type='application/json')
         response = client.get('/api/sessions')
         assert response.status_code == 200
         data = json.loads(response.data)
         assert isinstance(data, list)
+        assert data[0]['piece_count'] == 32
+        assert data[0]['score'] is None
+        assert 'T' in data[0]['created_at']
 
     def test_get_stats(self, client):
         """Test getting statistics"""
@@ -175,6 +296,104 @@ class TestAPIEndpoints:
         assert 'total_games' in data
         assert 'average_score' in data
 
+    def test_reload_positions_requires_key(self, client, monkeypatch):
+        """Test position cache reload rejects requests without the admin key"""
+        monkeypatch.setitem(app.config, 'SECRET_KEY', 'test-admin-key')
+        response = client.post('/admin/reload')
+        assert response.status_code == 403
+
+        response = client.post('/admin/reload', headers={'X-Admin-Key': 'wrong-key'})
+        assert response.status_code == 403
+
+    def test_reload_positions_disabled_with_default_key(self, client):
+        """Test position cache reload is refused while SECRET_KEY is a public default"""
+        response = client.post('/admin/reload', headers={'X-Admin-Key': 'dev-secret-key'})
+        assert response.status_code == 403
+
+    def test_reload_positions(self, client, monkeypatch):
+        """Test position cache reload picks up loaded positions"""
+        monkeypatch.setitem(app.config, 'SECRET_KEY', 'test-admin-key')
+        response = client.post('/admin/reload',
+                               headers={'X-Admin-Key': app.config['SECRET_KEY']})
+        assert response.status_code == 200
+        assert json.loads(response.data)['positions'] == 1
+
+        start_response = client.post('/api/game/start',
+                                     data=json.dumps({'piece_count': 32}),
+                                     content_type='application/json')
+        assert start_response.status_code == 201
+
+    def test_start_game_ignores_stale_cache(self, client):
+        """Test a cached id reused by a reload with another piece count is not served"""
+        client.post('/api/game/start',
+                    data=json.dumps({'piece_count': 32}),
+                    content_type='application/json')
+        assert POSITIONS_BY_COUNT.get(32)
+
+        # Another process replaces the positions, reusing the same id, without bumping the generation
+        with app.app_context():
+            position = db.session.get(ChessPosition, POSITIONS_BY_COUNT[32][0])
+            position.fen = '8/3K4/8/8/3k4/8/8/8 w - - 0 67'
+            position.piece_count = 2
+            db.session.commit()
+
+        response = client.post('/api/game/start',
+                               data=json.dumps({'piece_count': 32}),
+                               content_type='application/json')
+        assert response.status_code == 404
+        assert 32 not in POSITIONS_BY_COUNT
+
+    def test_start_game_picks_up_new_generation(self, client):
+        """Test workers rebuild their cache when another process bumps the generation"""
+        client.post('/api/game/start',
+                    data=json.dumps({'piece_count': 32}),
+                    content_type='application/json')
+
+        with app.app_context():
+            db.session.add(ChessPosition(fen='8/3K4/8/8/3k4/8/8/8 w - - 0 67', evaluation=0.0, piece_count=2))
+            bump_generation()
+            db.session.commit()
+
+        response = client.post('/api/game/start',
+                               data=json.dumps({'piece_count': 2}),
+                               content_type='application/json')
+        assert response.status_code == 201
+        assert POSITIONS_BY_COUNT.get(2)
+
+    def test_concurrent_refresh_rebuilds_once(self, client, monkeypatch):
+        """Test threads that see a new generation together share a single cache rebuild"""
+        import threading
+        import time
+        import app as app_module
+
+        # Make the rebuild slow enough for the threads to overlap, like a full-table scan
+        load_position_cache = app_module.load_position_cache
+
+        def slow_load_position_cache():
+            time.sleep(0.05)
+            load_position_cache()
+
+        monkeypatch.setattr(app_module, 'load_position_cache', slow_load_position_cache)
+
+        with app.app_context():
+            refresh_position_cache()
+            bump_generation()
+            db.session.commit()
+
+        builds = app_module._cache_builds
+
+        def refresh():
+            with app.app_context():
+                refresh_position_cache()
+
+        threads = [threading.Thread(target=refresh) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert app_module._cache_builds == builds + 1
+
     def test_index_route(self, client):
         """Test index route returns HTML"""
         response = client.get('/')